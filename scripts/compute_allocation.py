@@ -1,3 +1,5 @@
+import numpy as np
+
 # Config for Llama 3.1 70B
 H = 8192  # hidden size
 N_LAYERS = 80
@@ -38,20 +40,19 @@ BATCH_LENGTHS = [
 BATCH_SIZE = len(BATCH_LENGTHS)
 SEQ_LEN_SUM = sum(BATCH_LENGTHS)
 
-EXPANDED_BATCH_LENGTHS = [length for length in BATCH_LENGTHS for _ in range(N_HEADS)]
+EXPANDED_BATCH_LENGTHS = np.repeat(np.asarray(BATCH_LENGTHS, dtype=np.int64), N_HEADS)
 SN40L_COMP = 638  # TFLOP/s
 SN40L_MEM_BW = 1.8  # TB/s
 
 
 gen_qkv_flop = 1 * H * 3 * H
-q_kt_flop = [
-    N_HEADS * HEAD_DIM * seq_len + N_HEADS * seq_len
-    for seq_len in EXPANDED_BATCH_LENGTHS
-]
-attn_v_flop = [N_HEADS * HEAD_DIM * seq_len for seq_len in EXPANDED_BATCH_LENGTHS]
+q_kt_flop = (
+    N_HEADS * HEAD_DIM * EXPANDED_BATCH_LENGTHS + N_HEADS * EXPANDED_BATCH_LENGTHS
+)
+attn_v_flop = N_HEADS * HEAD_DIM * EXPANDED_BATCH_LENGTHS
 proj_flop = 1 * H * H
 
 print(gen_qkv_flop)
-print(q_kt_flop)
-print(attn_v_flop)
+print(q_kt_flop.tolist())
+print(attn_v_flop.tolist())
 print(proj_flop)
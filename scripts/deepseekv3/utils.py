@@ -5,7 +5,8 @@ def torch_tensor_to_npy(tensor: torch.Tensor, filename, dtype):
     np.save(filename, tensor.cpu().numpy().astype(dtype))
 
 def npy_to_torch_tensor(filename):
-    data = np.load(filename, allow_pickle=True)
+    # Memory-map the file so the data is copied once, straight into the torch tensor
+    data = np.load(filename, mmap_mode="r", allow_pickle=True)
     return torch.tensor(data, dtype=torch.float32)
 
 def create_indices(expert_dist, num_tokens, num_selected):
@@ -14,7 +15,9 @@ def create_indices(expert_dist, num_tokens, num_selected):
     Each row contains unique expert indices (no duplicates per token).
     
     Args:
-        expert_dist: [num_experts] tensor of probabilities for each expert
+        expert_dist: [num_experts] tensor of probabilities for each expert. It does not need
+            to be normalized and may be an integer tensor: it is cast to float and
+            torch.multinomial treats it as unnormalized weights.
         num_tokens: the total number of tokens
         num_selected: the number of experts to select for each token
 
@@ -29,16 +32,10 @@ def create_indices(expert_dist, num_tokens, num_selected):
     if num_selected > num_experts:
         raise ValueError(f"Cannot select {num_selected} unique experts from {num_experts} total experts")
     
-    # Ensure expert_dist is normalized
-    expert_dist = expert_dist / expert_dist.sum()
-    
-    # Sample unique experts for each token
-    indices = torch.zeros(num_tokens, num_selected, dtype=torch.long)
-    
-    for i in range(num_tokens):
-        # Sample without replacement for this token
-        selected = torch.multinomial(expert_dist, num_selected, replacement=False)
-        indices[i] = selected
+    # Sample unique experts for all tokens at once (each row is sampled
+    # independently without replacement)
+    probs = expert_dist.float().unsqueeze(0).expand(num_tokens, -1).contiguous()
+    indices = torch.multinomial(probs, num_selected, replacement=False)
     
     return indices
 
@@ -52,7 +49,7 @@ def create_route_scale(num_tokens, num_selected):
     # Generate random values between 0 and 1 for each token and selected expert
     random_values = torch.rand(num_tokens, num_selected, dtype=torch.float32)
     
-    # Normalize each row so the scale factors sum to 1
-    scale_factors = random_values / random_values.sum(dim=1, keepdim=True)
+    # Normalize each row in place so the scale factors sum to 1
+    random_values.div_(random_values.sum(dim=1, keepdim=True))
     
-    return scale_factors
\ No newline at end of file
+    return random_values
\ No newline at end of file
@@ -3,58 +3,100 @@ import json
 import os
 import argparse
 from collections import defaultdict
+from itertools import groupby, zip_longest
+
+import numpy as np
+
+REQUIRED_COLUMNS = ("id", "name", "start_ns", "end_ns")
+
+
+def to_float_column(values):
+    """Convert a column of strings to a float64 array, mapping invalid entries to NaN."""
+    try:
+        return np.asarray(values, dtype=np.float64)
+    except ValueError:
+        column = np.full(len(values), np.nan)
+        for idx, value in enumerate(values):
+            try:
+                column[idx] = float(value)
+            except ValueError:
+                pass
+        return column
+
+
+def name_id_sort_key(name_id_key):
+    """Sort key for a name_id key: numeric ids in ascending order, then other ids."""
+    event_id = name_id_key.rsplit("_", 1)[1]
+    if event_id.isdigit():
+        return (0, int(event_id), "")
+    return (1, 0, event_id)
 
 
 def parse_csv(csv_file):
     """Parse a CSV file and extract the necessary data grouped by name_id combination."""
     data_by_name_id = defaultdict(list)
-    global_min_time = float("inf")
-    global_max_time = 0
-    unique_name_ids = set()
-
-    with open(csv_file, "r") as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
-        if not rows:
-            return {}, [], 0, 0  # Empty file
-
-        # Process each row and group by name_id combination
-        for row_idx, row in enumerate(rows, 1):
-            # Check if required columns exist
-            if (
-                "start_ns" not in row
-                or "end_ns" not in row
-                or "id" not in row
-                or "name" not in row
-            ):
-                print(
-                    f"Warning: Row {row_idx} missing required columns (id, name, start_ns, end_ns)."
-                )
-                continue
-
-            # Parse values
-            try:
-                event_id = str(row["id"])  # Convert to string for consistency
-                event_name = str(
-                    row["name"]
-                ).strip()  # Convert to string and strip whitespace
-                start_time = float(row["start_ns"])
-                end_time = float(row["end_ns"])
-                is_stop = row.get("is_stop", "").lower() == "true"
-            except ValueError as e:
-                print(f"Warning: Row {row_idx} has invalid numeric values: {e}")
-                continue
-
-            # Create composite key using name and id
-            name_id_key = f"{event_name}_{event_id}"
-            unique_name_ids.add(name_id_key)
-
-            # Create identifier for this specific event
-            event_count = len(data_by_name_id[name_id_key]) + 1
-            identifier = f"event_{event_name}_{event_id}_{event_count}"
-
-            # Store data
-            item = {
+
+    with open(csv_file, "r", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        # Skip blank lines, as csv.DictReader does
+        rows = [row for row in reader if row]
+    if header is None or not rows:
+        return {}, [], 0, 0  # Empty file
+
+    # Check if required columns exist
+    missing = [col for col in REQUIRED_COLUMNS if col not in header]
+    if missing:
+        print(
+            f"Warning: {csv_file} missing required columns (id, name, start_ns, end_ns): {missing}"
+        )
+        return {}, [], 0, 0
+
+    # Transpose rows into columns (short rows are padded with empty strings)
+    columns = dict(zip(header, zip_longest(*rows, fillvalue="")))
+    start_times = to_float_column(columns["start_ns"])
+    end_times = to_float_column(columns["end_ns"])
+    event_names = np.char.strip(np.asarray(columns["name"], dtype=str)).tolist()
+    if "is_stop" in columns:
+        stop_flags = np.char.lower(np.asarray(columns["is_stop"], dtype=str)) == "true"
+    else:
+        stop_flags = np.zeros(len(rows), dtype=bool)
+
+    # Drop rows whose timing values could not be parsed
+    valid = ~(np.isnan(start_times) | np.isnan(end_times))
+    for row_idx in np.flatnonzero(~valid):
+        print(f"Warning: Row {row_idx + 1} has invalid numeric values.")
+    if not valid.any():
+        print(f"Warning: No valid data extracted from {csv_file}")
+        return {}, [], 0, 0
+
+    # Track min and max times for the timeline
+    global_min_time = float(start_times[valid].min())
+    global_max_time = float(end_times[valid].max())
+
+    # Process each row and group by name_id combination
+    for event_id, event_name, start_time, end_time, is_stop, is_valid in zip(
+        columns["id"],
+        event_names,
+        start_times.tolist(),
+        end_times.tolist(),
+        stop_flags.tolist(),
+        valid.tolist(),
+    ):
+        if not is_valid:
+            continue
+
+        # Create composite key using name and id
+        name_id_key = f"{event_name}_{event_id}"
+        name_id_data = data_by_name_id[name_id_key]
+
+        # Create identifier for this specific event
+        event_count = len(name_id_data) + 1
+        identifier = f"event_{event_name}_{event_id}_{event_count}"
+
+        # Store data
+        name_id_data.append(
+            {
                 "file_id": name_id_key,  # Using name_id combination as file_id for compatibility with existing HTML
                 "name": event_name,
                 "id": event_id,
@@ -64,65 +106,20 @@ def parse_csv(csv_file):
                 "end": end_time,
                 "is_stop": is_stop,
             }
-            data_by_name_id[name_id_key].append(item)
-
-            # Track min and max times for the timeline
-            global_min_time = min(global_min_time, start_time)
-            global_max_time = max(global_max_time, end_time)
+        )
 
     # Convert to list format expected by the HTML generator
     all_data = []
     # Sort by id in ascending order
-    sorted_name_ids = sorted(
-        unique_name_ids,
-        key=lambda x: (
-            int(x.rsplit("_", 1)[1])
-            if x.rsplit("_", 1)[1].isdigit()
-            else x.rsplit("_", 1)[1]
-        ),
-    )
+    sorted_name_ids = sorted(data_by_name_id, key=name_id_sort_key)
 
     for name_id_key in sorted_name_ids:
         all_data.extend(data_by_name_id[name_id_key])
 
-    # Check if we actually added any data
-    if not all_data:
-        print(f"Warning: No valid data extracted from {csv_file}")
-        return {}, [], 0, 0
-
     return all_data, sorted_name_ids, global_min_time, global_max_time
 
 
-def generate_html(data, name_id_list, min_time, max_time):
-    """Generate HTML for the Gantt chart visualization."""
-    # Group data by file_id (which is now the name_id combination)
-    file_data = defaultdict(list)
-    for item in data:
-        file_data[item["file_id"]].append(item)
-
-    # Generate JSON data for the visualization
-    visualization_data = []
-    for name_id_key in name_id_list:
-        items = file_data[name_id_key]
-        # Sort by start time
-        items.sort(key=lambda x: x["start"])
-
-        for item in items:
-            visualization_data.append(
-                {
-                    "file_id": name_id_key,
-                    "name": item["name"],
-                    "id": item["id"],
-                    "prefix": item["prefix"],
-                    "identifier": item["identifier"],
-                    "start": item["start"],
-                    "end": item["end"],
-                    "is_stop": item["is_stop"],
-                }
-            )
-
-    html_content = (
-        """
+HTML_HEAD = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -279,18 +276,9 @@ def generate_html(data, name_id_list, min_time, max_time):
 
     <script>
         // Data from Python
-        const data = """
-        + json.dumps(visualization_data)
-        + """;
-        const nameIdList = """
-        + json.dumps(name_id_list)
-        + """;
-        const minTime = """
-        + str(min_time)
-        + """;
-        const maxTime = """
-        + str(max_time)
-        + """;
+"""
+
+HTML_TAIL = """
         
         // Visualization variables
         let scale = 0.1;
@@ -306,7 +294,7 @@ def generate_html(data, name_id_list, min_time, max_time):
             const timelineWidth = (maxTime - minTime) * scale;
             
             // Create a row for each name_id combination
-            nameIdList.forEach(nameId => {
+            nameIdList.forEach((nameId, rowIdx) => {
                 const fileRow = document.createElement('div');
                 fileRow.className = 'file-row';
                 
@@ -323,9 +311,10 @@ def generate_html(data, name_id_list, min_time, max_time):
                 fileRow.appendChild(timelineContainer);
                 timelineEl.appendChild(fileRow);
                 
-                // Add blocks for this name_id combination
-                const fileDataItems = data.filter(item => item.file_id === nameId);
-                fileDataItems.forEach(item => {
+                // Add blocks for this name_id combination (attached in one batch)
+                const row = data[rowIdx];
+                const blocksFragment = document.createDocumentFragment();
+                row.events.forEach(item => {
                     const block = document.createElement('div');
                     
                     // Set color class based on is_stop flag
@@ -345,8 +334,8 @@ def generate_html(data, name_id_list, min_time, max_time):
                     
                     // Add tooltip data
                     block.dataset.identifier = item.identifier;
-                    block.dataset.name = item.name;
-                    block.dataset.id = item.id;
+                    block.dataset.name = row.name;
+                    block.dataset.id = row.id;
                     block.dataset.start = item.start;
                     block.dataset.end = item.end;
                     block.dataset.isStop = item.is_stop;
@@ -356,8 +345,9 @@ def generate_html(data, name_id_list, min_time, max_time):
                     block.addEventListener('mousemove', moveTooltip);
                     block.addEventListener('mouseout', hideTooltip);
                     
-                    timelineContainer.appendChild(block);
+                    blocksFragment.appendChild(block);
                 });
+                timelineContainer.appendChild(blocksFragment);
             });
             
             // Add time markers
@@ -454,9 +444,49 @@ def generate_html(data, name_id_list, min_time, max_time):
 </body>
 </html>
     """
-    )
 
-    return html_content
+
+def write_html(f, data, name_id_list, min_time, max_time):
+    """Write the HTML for the Gantt chart visualization to the open file f.
+
+    The JSON payload is streamed into f with json.dump instead of being
+    concatenated into one large string in memory.
+    """
+    # Order events by row (file_id is the name_id combination) and then by
+    # start time with a single sort
+    row_index = {name_id_key: idx for idx, name_id_key in enumerate(name_id_list)}
+    ordered_data = sorted(data, key=lambda x: (row_index[x["file_id"]], x["start"]))
+
+    # Generate JSON data for the visualization, one entry per name_id row in
+    # name_id_list order; name and id are shared by every event in a row
+    visualization_data = []
+    for _, items in groupby(ordered_data, key=lambda x: x["file_id"]):
+        items = list(items)
+        visualization_data.append(
+            {
+                "name": items[0]["name"],
+                "id": items[0]["id"],
+                "events": [
+                    {
+                        "identifier": item["identifier"],
+                        "start": item["start"],
+                        "end": item["end"],
+                        "is_stop": item["is_stop"],
+                    }
+                    for item in items
+                ],
+            }
+        )
+
+    f.write(HTML_HEAD)
+    f.write("        const data = ")
+    json.dump(visualization_data, f, separators=(",", ":"))
+    f.write(";\n        const nameIdList = ")
+    json.dump(name_id_list, f, separators=(",", ":"))
+    f.write(
+        f";\n        const minTime = {min_time};\n        const maxTime = {max_time};"
+    )
+    f.write(HTML_TAIL)
 
 
 def main():
@@ -490,12 +520,9 @@ def main():
     print(f"Time range: {min_time} - {max_time} ns")
     print(f"Total events: {len(data)}")
 
-    # Generate HTML content
-    html_content = generate_html(data, name_id_list, min_time, max_time)
-
-    # Write to output file
+    # Generate HTML content and write it to the output file
     with open(args.output_file, "w") as f:
-        f.write(html_content)
+        write_html(f, data, name_id_list, min_time, max_time)
 
     print(f"HTML Gantt chart generated at {args.output_file}")
 
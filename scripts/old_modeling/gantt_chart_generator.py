@@ -2,144 +2,179 @@ import csv
 import json
 import os
 import argparse
-from collections import defaultdict
+import base64
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from itertools import zip_longest
+
+import numpy as np
+
+# Accepted (start, end) timing column names, in order of preference
+TIMING_COLUMNS = (("start_ns", "end_ns"), ("start(ms)", "end(ms)"), ("start", "end"))
+
+
+def load_timing_columns(csv_file, header, timing_columns):
+    """Load only the timing (and output availability) columns of a CSV file with NumPy."""
+    usecols = [header.index(col) for col in timing_columns]
+    converters = {}
+    if "output_tile_available" in header:
+        available_idx = header.index("output_tile_available")
+        usecols.append(available_idx)
+        converters[available_idx] = lambda value: value == "True"
+
+    with warnings.catch_warnings():
+        # A header-only file is reported through the number of rows instead
+        warnings.simplefilter("ignore", UserWarning)
+        values = np.loadtxt(
+            csv_file,
+            delimiter=",",
+            comments=None,
+            quotechar='"',
+            skiprows=1,
+            usecols=usecols,
+            converters=converters,
+            dtype=np.float64,
+            ndmin=2,
+        )
+
+    start_times = np.ascontiguousarray(values[:, 0])
+    end_times = np.ascontiguousarray(values[:, 1])
+    if converters:
+        output_available = values[:, 2] == 1.0
+    else:
+        output_available = np.zeros(len(values), dtype=bool)
+    return start_times, end_times, output_available
 
 
 def parse_csv(csv_file):
     """Parse a CSV file and extract the necessary data."""
-    data = []
     file_id = os.path.basename(csv_file).split(".")[
         0
     ]  # Use filename without extension as ID
-    min_time = float("inf")
-    max_time = 0
 
     # Extract prefix from file_id
     prefix = file_id.split("_")[0] if "_" in file_id else file_id
 
-    with open(csv_file, "r") as f:
-        reader = csv.DictReader(f)
-        # Get the first row to check column names
-        rows = list(reader)
-        if not rows:
-            return [], file_id, 0, 0  # Empty file
-
-        for row in rows:
-            # Create identifier based on prefix
-            if prefix == "hbm":
-                # For hbm files, use the current identifier logic with error handling
-                try:
-                    if "num_elems" in row:
-                        identifier = f"{row.get('outer', 'N/A')},{row.get('m', 'N/A')},{row.get('n', 'N/A')},{row.get('k', 'N/A')} ({row['num_elems']})"
-                    else:
-                        identifier = f"{row.get('outer', 'N/A')},{row.get('m', 'N/A')},{row.get('n', 'N/A')},{row.get('k', 'N/A')}"
-                except KeyError:
-                    # If any required keys are missing, use a simpler identifier
-                    identifier = f"hbm_{file_id}"
-            else:
-                # For other prefixes, use the counter column if available, otherwise blank
-                identifier = row.get("counter", "")
-
-            # Check if start_ns and end_ns columns exist
-            if "start_ns" in row and "end_ns" in row:
-                start_time = float(row["start_ns"])
-                end_time = float(row["end_ns"])
-            # Fallback to old column names if necessary
-            elif "start(ms)" in row and "end(ms)" in row:
-                start_time = float(row["start(ms)"])
-                end_time = float(row["end(ms)"])
-            elif "start" in row and "end" in row:
-                start_time = float(row["start"])
-                end_time = float(row["end"])
-            else:
-                print(
-                    f"Warning: File {file_id} missing timing columns. Available columns: {list(row.keys())}"
-                )
-                continue  # Skip this row
-
-            # Store data
-            item = {
-                "file_id": file_id,
-                "prefix": prefix,
-                "identifier": identifier,
-                "start": start_time,
-                "end": end_time,
-                "output_available": (
-                    row.get("output_tile_available") == "True"
-                    if "output_tile_available" in row
-                    else False
-                ),
-            }
-            data.append(item)
-
-            # Track min and max times for the timeline
-            min_time = min(min_time, start_time)
-            max_time = max(max_time, end_time)
-
-    # Check if we actually added any data
-    if not data:
+    with open(csv_file, "r", newline="") as f:
+        header = next(csv.reader(f), None)
+    if header is None:
+        return {}, file_id, 0, 0  # Empty file
+
+    # Check which timing columns exist, falling back to old column names if necessary
+    timing_columns = next(
+        (
+            (start_col, end_col)
+            for start_col, end_col in TIMING_COLUMNS
+            if start_col in header and end_col in header
+        ),
+        None,
+    )
+    if timing_columns is None:
+        print(
+            f"Warning: File {file_id} missing timing columns. Available columns: {header}"
+        )
         print(f"Warning: No data extracted from {file_id}")
-        return [], file_id, 0, 0
+        return {}, file_id, 0, 0
+
+    if prefix != "hbm" and "counter" not in header:
+        # Only numeric columns are needed and every identifier is blank
+        start_times, end_times, output_available = load_timing_columns(
+            csv_file, header, timing_columns
+        )
+        num_rows = len(start_times)
+        identifiers = [""] * num_rows
+    else:
+        with open(csv_file, "r", newline="") as f:
+            reader = csv.reader(f)
+            next(reader)
+            # Skip blank lines, as csv.DictReader does
+            rows = [row for row in reader if row]
+        if not rows:
+            return {}, file_id, 0, 0  # Empty file
+
+        # Transpose rows into columns (short rows are padded with empty strings)
+        num_rows = len(rows)
+        columns = dict(zip(header, zip_longest(*rows, fillvalue="")))
+
+        start_times = np.asarray(columns[timing_columns[0]], dtype=np.float64)
+        end_times = np.asarray(columns[timing_columns[1]], dtype=np.float64)
+
+        # Create identifiers based on prefix
+        if prefix == "hbm":
+            # For hbm files, identify each access by its outer,m,n,k coordinates
+            coords = [
+                columns.get(col, ("N/A",) * num_rows)
+                for col in ("outer", "m", "n", "k")
+            ]
+            identifiers = [",".join(coord) for coord in zip(*coords)]
+            if "num_elems" in columns:
+                identifiers = [
+                    f"{identifier} ({num_elems})"
+                    for identifier, num_elems in zip(identifiers, columns["num_elems"])
+                ]
+        else:
+            # For other prefixes, use the counter column
+            identifiers = list(columns["counter"])
+
+        if "output_tile_available" in columns:
+            output_available = (
+                np.asarray(columns["output_tile_available"], dtype=str) == "True"
+            )
+        else:
+            output_available = np.zeros(num_rows, dtype=bool)
+
+    if num_rows == 0:
+        return {}, file_id, 0, 0  # Empty file
+
+    # Store data as one array per column
+    data = {
+        "file_id": file_id,
+        "prefix": prefix,
+        "identifier": identifiers,
+        "start": start_times,
+        "end": end_times,
+        "output_available": output_available,
+    }
+
+    # Track min and max times for the timeline
+    min_time = float(start_times.min())
+    max_time = float(end_times.max())
 
     return data, file_id, min_time, max_time
 
 
 def process_multiple_files(csv_files):
-    """Process multiple CSV files and combine their data."""
+    """Process multiple CSV files and collect their per-file column data."""
     all_data = []
     all_file_ids = []
-    global_min_time = float("inf")
-    global_max_time = 0
-
-    for csv_file in csv_files:
-        print(f"Processing {csv_file}...")
-        data, file_id, min_time, max_time = parse_csv(csv_file)
-
-        if data:  # Only add non-empty results
-            all_data.extend(data)
-            all_file_ids.append(file_id)
-
-            if min_time < global_min_time:
-                global_min_time = min_time
-            if max_time > global_max_time:
-                global_max_time = max_time
+    min_times = []
+    max_times = []
+
+    print(f"Processing {len(csv_files)} files...")
+
+    # Files are independent, so parse them in parallel worker processes
+    with ProcessPoolExecutor() as executor:
+        results = executor.map(parse_csv, csv_files)
+        for csv_file, (data, file_id, min_time, max_time) in zip(csv_files, results):
+            print(f"Processed {csv_file}")
+            if data:  # Only add non-empty results
+                all_data.append(data)
+                all_file_ids.append(file_id)
+                min_times.append(min_time)
+                max_times.append(max_time)
 
     # Check if we have any data
     if not all_data:
         print("Error: No data could be extracted from any of the CSV files.")
         return [], [], 0, 0
 
-    return all_data, all_file_ids, global_min_time, global_max_time
+    global_min_time = float(np.min(min_times))
+    global_max_time = float(np.max(max_times))
 
+    return all_data, all_file_ids, global_min_time, global_max_time
 
-def generate_html(data, file_ids, min_time, max_time):
-    """Generate HTML for the Gantt chart visualization."""
-    # Group data by file_id
-    file_data = defaultdict(list)
-    for item in data:
-        file_data[item["file_id"]].append(item)
 
-    # Generate JSON data for the visualization
-    visualization_data = []
-    for file_id in file_ids:
-        items = file_data[file_id]
-        # Sort by start time
-        items.sort(key=lambda x: x["start"])
-
-        for item in items:
-            visualization_data.append(
-                {
-                    "file_id": file_id,
-                    "prefix": item["prefix"],
-                    "identifier": item["identifier"],
-                    "start": item["start"],
-                    "end": item["end"],
-                    "output_available": item["output_available"],
-                }
-            )
-
-    html_content = (
-        """
+HTML_HEAD = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -317,18 +352,9 @@ def generate_html(data, file_ids, min_time, max_time):
 
     <script>
         // Data from Python
-        const data = """
-        + json.dumps(visualization_data)
-        + """;
-        const fileIds = """
-        + json.dumps(file_ids)
-        + """;
-        const minTime = """
-        + str(min_time)
-        + """;
-        const maxTime = """
-        + str(max_time)
-        + """;
+"""
+
+HTML_TAIL = """
         
         // Visualization variables
         let scale = 0.1;
@@ -338,13 +364,27 @@ def generate_html(data, file_ids, min_time, max_time):
         let scaleSlider = document.getElementById('scale-slider');
         let scaleValue = document.getElementById('scale-value');
         
-        // Function to render the timeline
-        function renderTimeline() {
+        // Decode a base64 buffer from Python into a typed array (Float32Array
+        // for layout positions, Float64Array for exact tooltip times)
+        function decodeBuffer(encoded, ArrayType) {
+            const bytes = Uint8Array.from(atob(encoded), c => c.charCodeAt(0));
+            return new ArrayType(bytes.buffer);
+        }
+        
+        // Block elements are created once and only repositioned when the scale changes
+        let rowContainers = [];
+        let blockEntries = [];
+        let markerEls = [];
+        
+        // Function to build the rows and blocks of the timeline
+        function buildTimeline() {
             timelineEl.innerHTML = '';
-            const timelineWidth = (maxTime - minTime) * scale;
+            rowContainers = [];
+            blockEntries = [];
+            markerEls = [];
             
             // Create a row for each file
-            fileIds.forEach(fileId => {
+            fileIds.forEach((fileId, rowIdx) => {
                 const fileRow = document.createElement('div');
                 fileRow.className = 'file-row';
                 
@@ -355,54 +395,70 @@ def generate_html(data, file_ids, min_time, max_time):
                 
                 const timelineContainer = document.createElement('div');
                 timelineContainer.className = 'timeline-container';
-                timelineContainer.style.width = `${timelineWidth}px`;
                 
                 fileRow.appendChild(fileLabel);
                 fileRow.appendChild(timelineContainer);
                 timelineEl.appendChild(fileRow);
+                rowContainers.push(timelineContainer);
+                
+                // Add blocks for this file (attached in one batch)
+                const fileData = groupedData[rowIdx];
+                const blocksFragment = document.createDocumentFragment();
                 
-                // Add blocks for this file
-                const fileDataItems = data.filter(item => item.file_id === fileId);
-                fileDataItems.forEach(item => {
+                // Set color class based on prefix
+                const prefix = fileData.prefix;
+                const blockClass = ['comp', 'hbm', 'load', 'store'].includes(prefix)
+                    ? `block prefix-${prefix}`
+                    : 'block prefix-default';
+                
+                const startOffsets = decodeBuffer(fileData.start_offset, Float32Array);
+                const durations = decodeBuffer(fileData.duration, Float32Array);
+                const starts = decodeBuffer(fileData.start, Float64Array);
+                const ends = decodeBuffer(fileData.end, Float64Array);
+                startOffsets.forEach((startOffset, i) => {
+                    const duration = durations[i];
+                    const identifier = fileData.identifier[i];
                     const block = document.createElement('div');
-                    
-                    // Set color class based on prefix
-                    const prefix = item.prefix;
-                    if (['comp', 'hbm', 'load', 'store'].includes(prefix)) {
-                        block.className = `block prefix-${prefix}`;
-                    } else {
-                        block.className = 'block prefix-default';
-                    }
-                    
-                    // Position and size based on time values
-                    const left = (item.start - minTime) * scale;
-                    const width = (item.end - item.start) * scale;
-                    
-                    block.style.left = `${left}px`;
-                    block.style.width = `${Math.max(width, 1)}px`;
-                    
-                    // Only show text if there's enough space and we have an identifier
-                    if (width > 40 && item.identifier) {
-                        block.textContent = item.identifier;
-                    }
+                    block.className = blockClass;
                     
                     // Add tooltip data
-                    block.dataset.prefix = item.prefix;
-                    block.dataset.identifier = item.identifier || 'No identifier';
-                    block.dataset.start = item.start;
-                    block.dataset.end = item.end;
-                    block.dataset.outputAvailable = item.output_available;
+                    block.dataset.prefix = prefix;
+                    block.dataset.identifier = identifier || 'No identifier';
+                    block.dataset.start = starts[i];
+                    block.dataset.end = ends[i];
+                    block.dataset.outputAvailable = fileData.output_available[i];
                     
-                    // Add event listeners for tooltip
-                    block.addEventListener('mouseover', showTooltip);
-                    block.addEventListener('mousemove', moveTooltip);
-                    block.addEventListener('mouseout', hideTooltip);
-                    
-                    timelineContainer.appendChild(block);
+                    blocksFragment.appendChild(block);
+                    blockEntries.push({ block, startOffset, duration, identifier });
                 });
+                timelineContainer.appendChild(blocksFragment);
+            });
+        }
+        
+        // Function to position the timeline at the current scale
+        function renderTimeline() {
+            const timelineWidth = (maxTime - minTime) * scale;
+            rowContainers.forEach(timelineContainer => {
+                timelineContainer.style.width = `${timelineWidth}px`;
+            });
+            
+            blockEntries.forEach(({ block, startOffset, duration, identifier }) => {
+                // Position and size based on time values
+                const left = startOffset * scale;
+                const width = duration * scale;
+                block.style.cssText = `left:${left}px;width:${Math.max(width, 1)}px;`;
+                
+                // Only show text if there's enough space and we have an identifier
+                const text = width > 40 && identifier ? identifier : '';
+                if (block.textContent !== text) {
+                    block.textContent = text;
+                }
             });
             
-            // Add time markers
+            // Replace the time markers
+            markerEls.forEach(marker => marker.remove());
+            markerEls = [];
+            const markersFragment = document.createDocumentFragment();
             const stepSize = calculateStepSize(maxTime - minTime);
             for (let t = minTime; t <= maxTime; t += stepSize) {
                 const marker = document.createElement('div');
@@ -414,8 +470,10 @@ def generate_html(data, file_ids, min_time, max_time):
                 label.textContent = t.toFixed(2) + 'ns';
                 
                 marker.appendChild(label);
-                timelineEl.appendChild(marker);
+                markersFragment.appendChild(marker);
+                markerEls.push(marker);
             }
+            timelineEl.appendChild(markersFragment);
         }
         
         // Calculate appropriate step size for timeline markers
@@ -457,6 +515,17 @@ def generate_html(data, file_ids, min_time, max_time):
             tooltipEl.style.display = 'none';
         }
         
+        // Tooltip listeners are delegated from the timeline to its blocks
+        timelineEl.addEventListener('mouseover', e => {
+            if (e.target.classList.contains('block')) showTooltip(e);
+        });
+        timelineEl.addEventListener('mousemove', e => {
+            if (e.target.classList.contains('block')) moveTooltip(e);
+        });
+        timelineEl.addEventListener('mouseout', e => {
+            if (e.target.classList.contains('block')) hideTooltip();
+        });
+        
         // Initialize controls
         document.getElementById('zoom-in').addEventListener('click', () => {
             scale *= 1.5;
@@ -490,14 +559,62 @@ def generate_html(data, file_ids, min_time, max_time):
         
         // Initial render
         updateScale();
+        buildTimeline();
         renderTimeline();
     </script>
 </body>
 </html>
     """
-    )
 
-    return html_content
+
+def encode_buffer(values, dtype):
+    """Encode values as a base64 little-endian buffer for a JS typed array.
+
+    dtype is "<f4" for a Float32Array or "<f8" for a Float64Array.
+    """
+    return base64.b64encode(np.asarray(values, dtype=dtype).tobytes()).decode("ascii")
+
+
+def write_html(f, data, file_ids, min_time, max_time):
+    """Write the HTML for the Gantt chart visualization to the open file f.
+
+    The JSON payload is streamed into f with json.dump instead of being
+    concatenated into one large string in memory.
+    """
+    # Generate JSON data for the visualization, one entry per file in the same
+    # order as file_ids so rows are looked up by position (file_ids can repeat
+    # when two inputs share a basename)
+    visualization_data = []
+    for file_data in data:
+        # Sort by start time
+        order = np.argsort(file_data["start"], kind="stable")
+        identifiers = file_data["identifier"]
+        start_times = file_data["start"][order]
+        end_times = file_data["end"][order]
+
+        # Positions are shipped relative to min_time as float32 buffers for
+        # layout; the exact start and end times for the tooltip as float64
+        visualization_data.append(
+            {
+                "prefix": file_data["prefix"],
+                "identifier": [identifiers[idx] for idx in order.tolist()],
+                "start_offset": encode_buffer(start_times - min_time, "<f4"),
+                "duration": encode_buffer(end_times - start_times, "<f4"),
+                "start": encode_buffer(start_times, "<f8"),
+                "end": encode_buffer(end_times, "<f8"),
+                "output_available": file_data["output_available"][order].tolist(),
+            }
+        )
+
+    f.write(HTML_HEAD)
+    f.write("        const groupedData = ")
+    json.dump(visualization_data, f, separators=(",", ":"))
+    f.write(";\n        const fileIds = ")
+    json.dump(file_ids, f, separators=(",", ":"))
+    f.write(
+        f";\n        const minTime = {min_time};\n        const maxTime = {max_time};"
+    )
+    f.write(HTML_TAIL)
 
 
 def main():
@@ -524,12 +641,9 @@ def main():
         print("Error: No valid data found in any of the provided CSV files.")
         return
 
-    # Generate HTML content
-    html_content = generate_html(data, file_ids, min_time, max_time)
-
-    # Write to output file
+    # Generate HTML content and write it to the output file
     with open(args.output_file, "w") as f:
-        f.write(html_content)
+        write_html(f, data, file_ids, min_time, max_time)
 
     print(f"HTML Gantt chart generated at {args.output_file}")
 
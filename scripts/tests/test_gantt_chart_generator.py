@@ -0,0 +1,105 @@
+import contextlib
+import importlib.util
+import io
+import os
+import tempfile
+
+# Load scripts/gantt_chart_generator.py from its path so the test does not
+# depend on PYTHONPATH
+_spec = importlib.util.spec_from_file_location(
+    "gantt_chart_generator",
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "..", "gantt_chart_generator.py"
+    ),
+)
+gantt = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(gantt)
+
+
+def parse(tmp_path, content):
+    """Write content to a CSV file and return (parse_csv result, printed output)."""
+    csv_file = os.path.join(tmp_path, "trace.csv")
+    with open(csv_file, "w") as f:
+        f.write(content)
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        result = gantt.parse_csv(csv_file)
+    return result, out.getvalue()
+
+
+def test_parse_csv_skips_blank_lines(tmp_path):
+    """Blank lines are skipped silently and do not shift warning row numbers."""
+    (data, name_ids, min_time, max_time), printed = parse(
+        tmp_path,
+        "id,name,start_ns,end_ns,is_stop\n"
+        "1,load,10,20,false\n"
+        "\n"
+        "1,load,30,40,TRUE\n"
+        "2,comp,bad,50,false\n"
+        "\n",
+    )
+
+    assert printed == "Warning: Row 3 has invalid numeric values.\n"
+    assert name_ids == ["load_1"]
+    assert [item["identifier"] for item in data] == ["event_load_1_1", "event_load_1_2"]
+    assert [item["is_stop"] for item in data] == [False, True]
+    assert (min_time, max_time) == (10.0, 40.0)
+
+
+def test_parse_csv_masks_invalid_and_short_rows(tmp_path):
+    """Rows with unparsable or missing timings are dropped from data and the
+    time range, and names are stripped."""
+    (data, name_ids, min_time, max_time), printed = parse(
+        tmp_path,
+        "id,name,start_ns,end_ns\n"
+        "1, load ,10,20\n"
+        "2,comp,5\n"
+        "3,store,,1000\n"
+        "1, load ,30,40\n",
+    )
+
+    assert printed == (
+        "Warning: Row 2 has invalid numeric values.\n"
+        "Warning: Row 3 has invalid numeric values.\n"
+    )
+    assert name_ids == ["load_1"]
+    assert [item["name"] for item in data] == ["load", "load"]
+    assert [item["start"] for item in data] == [10.0, 30.0]
+    assert (min_time, max_time) == (10.0, 40.0)
+
+
+def test_parse_csv_requires_columns_in_header(tmp_path):
+    """A missing required column is reported once and yields no data."""
+    (data, name_ids, min_time, max_time), printed = parse(
+        tmp_path, "id,start_ns,end_ns\n1,10,20\n2,30,40\n"
+    )
+
+    assert printed.count("Warning:") == 1
+    assert "['name']" in printed
+    assert (data, name_ids, min_time, max_time) == ({}, [], 0, 0)
+
+
+def test_parse_csv_sorts_numeric_ids_before_other_ids(tmp_path):
+    """Numeric ids sort numerically, followed by non-numeric ids in string order."""
+    (_, name_ids, _, _), _ = parse(
+        tmp_path,
+        "id,name,start_ns,end_ns\n"
+        "b,op,0,1\n"
+        "10,op,0,1\n"
+        "a,op,0,1\n"
+        "2,op,0,1\n",
+    )
+
+    assert name_ids == ["op_2", "op_10", "op_a", "op_b"]
+
+
+if __name__ == "__main__":
+    for test in (
+        test_parse_csv_skips_blank_lines,
+        test_parse_csv_masks_invalid_and_short_rows,
+        test_parse_csv_requires_columns_in_header,
+        test_parse_csv_sorts_numeric_ids_before_other_ids,
+    ):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            test(tmp_dir)
+    print("All tests passed!")
@@ -1,3 +1,4 @@
+import numpy as np
 import torch
 from deepseekv3.utils import create_indices
 
@@ -12,9 +13,15 @@ def verify_distribution(indices, num_experts):
     Returns:
         empirical_dist: [num_experts] empirical probability distribution
     """
-    flat_indices = indices.flatten()
-    counts = torch.bincount(flat_indices, minlength=num_experts)
-    empirical_dist = counts.float() / counts.sum()
+    if indices.is_cuda:
+        flat_indices = indices.flatten()
+        counts = torch.bincount(flat_indices, minlength=num_experts)
+        return counts.float() / counts.sum()
+
+    # On CPU, count through a NumPy view of the indices to skip the flattened copy
+    flat_indices = indices.numpy().ravel()
+    counts = np.bincount(flat_indices, minlength=num_experts)
+    empirical_dist = torch.from_numpy(counts.astype(np.float32) / flat_indices.size)
     return empirical_dist
 
 if __name__ == "__main__":
@@ -0,0 +1,118 @@
+import base64
+import importlib.util
+import io
+import json
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+# scripts/old_modeling is not a package and shares its module name with
+# scripts/gantt_chart_generator.py, so load it from its path
+_spec = importlib.util.spec_from_file_location(
+    "old_gantt_chart_generator",
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "..",
+        "old_modeling",
+        "gantt_chart_generator.py",
+    ),
+)
+old_gantt = importlib.util.module_from_spec(_spec)
+# Register the module so process_multiple_files can pickle parse_csv for its workers
+sys.modules[_spec.name] = old_gantt
+_spec.loader.exec_module(old_gantt)
+
+
+def test_loadtxt_path_handles_hash_and_quoted_comma(tmp_path):
+    """A non-hbm CSV without a counter column goes through np.loadtxt; '#' and
+    quoted commas in other columns must not shift the timing columns."""
+    csv_file = os.path.join(tmp_path, "comp_quoted.csv")
+    with open(csv_file, "w") as f:
+        f.write("name,start_ns,end_ns,output_tile_available\n")
+        f.write("op#1,10,20,True\n")
+        f.write('"a,b",30,45,False\n')
+
+    data, file_id, min_time, max_time = old_gantt.parse_csv(csv_file)
+
+    assert file_id == "comp_quoted"
+    assert data["start"].tolist() == [10.0, 30.0]
+    assert data["end"].tolist() == [20.0, 45.0]
+    assert data["output_available"].tolist() == [True, False]
+    assert data["identifier"] == ["", ""]
+    assert (min_time, max_time) == (10.0, 45.0)
+
+
+def test_parse_csv_skips_blank_lines(tmp_path):
+    """Blank lines, including a trailing one, are skipped on every parse path."""
+    contents = {
+        "comp_counter.csv": "counter,start_ns,end_ns\nx,10,20\n\ny,30,40\n\n",
+        "hbm_load.csv": "outer,m,n,k,start_ns,end_ns\n0,1,2,3,10,20\n\n0,1,2,4,30,40\n\n",
+        "load_plain.csv": "start_ns,end_ns\n10,20\n\n30,40\n\n",
+    }
+    for name, content in contents.items():
+        csv_file = os.path.join(tmp_path, name)
+        with open(csv_file, "w") as f:
+            f.write(content)
+
+        data, _, min_time, max_time = old_gantt.parse_csv(csv_file)
+
+        assert data["start"].tolist() == [10.0, 30.0]
+        assert data["end"].tolist() == [20.0, 40.0]
+        assert len(data["identifier"]) == 2
+        assert (min_time, max_time) == (10.0, 40.0)
+
+
+def test_write_html_keeps_files_with_same_basename(tmp_path):
+    """Two inputs named comp_x.csv in different directories get one row each."""
+    csv_files = []
+    for run, (start, end) in (("r1", (10, 20)), ("r2", (30, 45))):
+        os.makedirs(os.path.join(tmp_path, run))
+        csv_file = os.path.join(tmp_path, run, "comp_x.csv")
+        with open(csv_file, "w") as f:
+            f.write(f"counter,start_ns,end_ns\n{run},{start},{end}\n")
+        csv_files.append(csv_file)
+
+    data, file_ids, min_time, max_time = old_gantt.process_multiple_files(csv_files)
+    assert file_ids == ["comp_x", "comp_x"]
+
+    out = io.StringIO()
+    old_gantt.write_html(out, data, file_ids, min_time, max_time)
+    payload = out.getvalue().split("const groupedData = ", 1)[1].split(";", 1)[0]
+    grouped = json.loads(payload)
+    assert [entry["identifier"] for entry in grouped] == [["r1"], ["r2"]]
+
+
+def test_write_html_keeps_exact_times_for_tooltip(tmp_path):
+    """Large timestamps survive exactly in the tooltip start/end buffers even
+    though the float32 layout offsets lose precision."""
+    csv_file = os.path.join(tmp_path, "comp_big.csv")
+    with open(csv_file, "w") as f:
+        f.write("counter,start_ns,end_ns\n")
+        f.write("a,123456789,123456790.25\n")
+        f.write("b,10,20\n")
+
+    data, file_ids, min_time, max_time = old_gantt.process_multiple_files([csv_file])
+    out = io.StringIO()
+    old_gantt.write_html(out, data, file_ids, min_time, max_time)
+    payload = out.getvalue().split("const groupedData = ", 1)[1].split(";", 1)[0]
+    (entry,) = json.loads(payload)
+
+    def decode(key, dtype):
+        return np.frombuffer(base64.b64decode(entry[key]), dtype=dtype).tolist()
+
+    assert decode("start", "<f8") == [10.0, 123456789.0]
+    assert decode("end", "<f8") == [20.0, 123456790.25]
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_loadtxt_path_handles_hash_and_quoted_comma(tmp_dir)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_parse_csv_skips_blank_lines(tmp_dir)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_write_html_keeps_files_with_same_basename(tmp_dir)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_write_html_keeps_exact_times_for_tooltip(tmp_dir)
+    print("All tests passed!")